@@ -2,18 +2,28 @@
 To-do MCP Server with FastAPI and Azure AI Agents - Simplified and Working
 """
 import os
+import asyncio
+import bisect
+import hashlib
+import itertools
 import logging
+import secrets
 import traceback
+from dataclasses import asdict, dataclass
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, JSONResponse
-from pydantic import BaseModel
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
+import msgspec
+import orjson
+from pydantic import BaseModel, PrivateAttr
+from starlette.exceptions import HTTPException as StarletteHTTPException
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -42,6 +52,9 @@ try:
     from azure.identity import DefaultAzureCredential
     from azure.ai.agents import AgentsClient
     from azure.ai.agents.models import McpTool
+    from azure.core.pipeline.transport import RequestsTransport
+    import requests
+    from requests.adapters import HTTPAdapter
     AZURE_AI_AVAILABLE = True
     logger.info("✅ Azure AI packages available")
 except ImportError as e:
@@ -49,13 +62,56 @@ except ImportError as e:
     logger.warning(f"⚠️ Azure AI packages not available: {e}")
     logger.info("ℹ️ App will run in basic mode (todo functionality only)")
 
+# Optional Redis support for sharing chat sessions across workers/instances
+try:
+    import redis.asyncio as redis_asyncio
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
 # Configuration (all from environment variables from Bicep deployment)
 
 
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Environment configuration, read once at startup"""
+    project_endpoint: Optional[str]
+    project_name: Optional[str]
+    model_deployment: Optional[str]
+    app_service_url: str
+    # Browser origins allowed to call the API cross-origin (ALLOWED_ORIGINS, comma-separated).
+    # The web UI is served from the app itself, so by default only its own origin is allowed.
+    allowed_origins: Tuple[str, ...]
+    # Shared secret for the /debug endpoint (sent as X-Debug-Token); the endpoint is disabled when unset
+    debug_token: Optional[str]
+    # Redis connection string for chat sessions; sessions stay in process memory when unset
+    redis_url: Optional[str]
+    # uvicorn worker processes when started via `python main.py` (to-dos are per-process, so keep at 1)
+    workers: int
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        app_service_url = os.getenv('AZURE_APP_SERVICE_URL', 'http://localhost:8000')
+        allowed_origins = os.getenv('ALLOWED_ORIGINS', app_service_url)
+        return cls(
+            project_endpoint=os.getenv('AZURE_AI_PROJECT_ENDPOINT'),
+            project_name=os.getenv('AZURE_AI_PROJECT_NAME'),
+            model_deployment=os.getenv('AZURE_OPENAI_DEPLOYMENT_NAME'),
+            app_service_url=app_service_url,
+            allowed_origins=tuple(origin.strip() for origin in allowed_origins.split(',') if origin.strip()),
+            debug_token=os.getenv('DEBUG_TOKEN'),
+            redis_url=os.getenv('REDIS_URL'),
+            workers=int(os.getenv('UVICORN_WORKERS', '1')),
+        )
+
+
+settings = Settings.from_env()
+
+
 def get_azure_ai_project_endpoint():
-    """Get Azure AI Project endpoint from environment variables"""
-    azure_ai_endpoint = os.getenv('AZURE_AI_PROJECT_ENDPOINT')
-    azure_ai_project_name = os.getenv('AZURE_AI_PROJECT_NAME')
+    """Get Azure AI Project endpoint from settings"""
+    azure_ai_endpoint = settings.project_endpoint
+    azure_ai_project_name = settings.project_name
     
     if not azure_ai_endpoint:
         raise ValueError("AZURE_AI_PROJECT_ENDPOINT environment variable is required")
@@ -81,13 +137,12 @@ def get_azure_ai_project_endpoint():
 # Make Azure AI configuration optional for local development
 try:
     PROJECT_ENDPOINT = get_azure_ai_project_endpoint()
-    MODEL_DEPLOYMENT = os.getenv('AZURE_OPENAI_DEPLOYMENT_NAME')
+    MODEL_DEPLOYMENT = settings.model_deployment
     if not MODEL_DEPLOYMENT:
         raise ValueError("AZURE_OPENAI_DEPLOYMENT_NAME environment variable is required")
     
     # MCP server URL from Bicep deployment or default to localhost
-    azure_app_service_url = os.getenv('AZURE_APP_SERVICE_URL', 'http://localhost:8000')
-    MCP_SERVER_URL = azure_app_service_url + "/mcp/stream"
+    MCP_SERVER_URL = settings.app_service_url + "/mcp/stream"
     MCP_SERVER_LABEL = "todolist"
     AI_CONFIG_AVAILABLE = True
     logger.info("✓ Azure AI configuration loaded successfully")
@@ -109,6 +164,8 @@ class Todo(BaseModel):
     completed: bool = False
     priority: str = "medium"
     created_at: Optional[str] = None
+    # orjson-encoded form of the todo, filled on first read and cleared on every change
+    _json_bytes: Optional[bytes] = PrivateAttr(default=None)
 
 class ChatMessage(BaseModel):
     message: str
@@ -122,31 +179,306 @@ class ChatResponse(BaseModel):
     agent_id: Optional[str] = None
     thread_id: Optional[str] = None
 
-class ChatSession(BaseModel):
+@dataclass(slots=True)
+class ChatSession:
     session_id: str
     agent_id: Optional[str] = None
     thread_id: Optional[str] = None
 
+# Allowed todo priorities; the ordered tuple feeds the MCP tool schemas, the frozenset is for O(1) checks
+PRIORITIES = ("low", "medium", "high")
+VALID_PRIORITIES = frozenset(PRIORITIES)
+
+def validate_priority(priority) -> None:
+    """Raise ValueError unless `priority` is one of PRIORITIES"""
+    if not isinstance(priority, str) or priority not in VALID_PRIORITIES:
+        raise ValueError(f"Priority must be one of: {', '.join(PRIORITIES)}")
+
+# Longest accepted todo title; also advertised as maxLength in the MCP tool schemas
+TODO_TITLE_MAX_LENGTH = 200
+
+def validate_title(title) -> str:
+    """Return the stripped title; ValueError unless it is 1 to TODO_TITLE_MAX_LENGTH characters"""
+    if not isinstance(title, str) or not (title := title.strip()):
+        raise ValueError("Title is required")
+    if len(title) > TODO_TITLE_MAX_LENGTH:
+        raise ValueError(f"Title must be at most {TODO_TITLE_MAX_LENGTH} characters")
+    return title
+
+def validate_description(description) -> None:
+    """Raise ValueError unless `description` is a string"""
+    if not isinstance(description, str):
+        raise ValueError("Description must be a string")
+
+def validate_completed(completed) -> None:
+    """Raise ValueError unless `completed` is a JSON boolean (strings like "false" are not coerced)"""
+    if not isinstance(completed, bool):
+        raise ValueError("Completed must be a boolean")
+
 # Simple in-memory storage for todos
 todos_storage: Dict[int, Todo] = {}
-next_id = 1
+# Returns the next todo ID; a single C call, so no read-modify-write on a global
+next_todo_id = itertools.count(1).__next__
+
+# Completion index kept alongside the storage, so filtered listing only touches matching todos.
+# Each list is kept sorted by id (creation order), so listing never has to sort.
+completed_todo_ids: List[int] = []
+active_todo_ids: List[int] = []
+
+def index_todo_id(todo_ids: List[int], todo_id: int) -> None:
+    """Insert an id into a sorted completion index (an append for newly created todos)"""
+    bisect.insort(todo_ids, todo_id)
+
+def unindex_todo_id(todo_ids: List[int], todo_id: int) -> None:
+    """Remove an id from a sorted completion index"""
+    position = bisect.bisect_left(todo_ids, todo_id)
+    if position < len(todo_ids) and todo_ids[position] == todo_id:
+        del todo_ids[position]
+
+# Bumped on every change; together with the per-process prefix it forms the /api/todos ETag
+todos_version = 0
+TODOS_ETAG_PREFIX = secrets.token_hex(4)
+# Encoded /api/todos bodies keyed by completion filter, valid for the current todos_version
+todo_list_cache: Dict[Optional[bool], bytes] = {}
+
+def mark_todos_changed() -> None:
+    """Invalidate list ETags and cached list bodies after any change"""
+    global todos_version
+    todos_version += 1
+    todo_list_cache.clear()
+
+def add_todo(todo: Todo) -> None:
+    """Store a todo and index it by completion status"""
+    todos_storage[todo.id] = todo
+    index_todo_id(completed_todo_ids if todo.completed else active_todo_ids, todo.id)
+    mark_todos_changed()
+
+def remove_todo(todo_id: int) -> Optional[Todo]:
+    """Remove a todo from storage and the completion index"""
+    todo = todos_storage.pop(todo_id, None)
+    if todo is not None:
+        unindex_todo_id(completed_todo_ids if todo.completed else active_todo_ids, todo_id)
+        mark_todos_changed()
+    return todo
+
+def set_todo_completed(todo: Todo, completed: bool) -> None:
+    """Update a todo's completion status and move it to the matching index"""
+    if todo.completed == completed:
+        # Unchanged: keep the index and the cached JSON as they are
+        return
+    if todos_storage.get(todo.id) is not todo:
+        # Deleted meanwhile; re-indexing its id would leave a dangling entry for list_todos
+        return
+    if completed:
+        unindex_todo_id(active_todo_ids, todo.id)
+        index_todo_id(completed_todo_ids, todo.id)
+    else:
+        unindex_todo_id(completed_todo_ids, todo.id)
+        index_todo_id(active_todo_ids, todo.id)
+    todo.completed = completed
+    todo._json_bytes = None
+    mark_todos_changed()
+
+def update_todo_fields(todo: Todo, changes: dict) -> None:
+    """Apply the editable fields present in `changes` to a todo"""
+    if "title" in changes:
+        title = validate_title(changes["title"])
+    if "description" in changes and changes["description"] is not None:
+        validate_description(changes["description"])
+    if "priority" in changes:
+        validate_priority(changes["priority"])
+    if "completed" in changes:
+        validate_completed(changes["completed"])
+    
+    if "title" in changes:
+        todo.title = title
+    if "description" in changes:
+        todo.description = changes["description"] or ""
+    if "priority" in changes:
+        todo.priority = changes["priority"]
+    if "completed" in changes:
+        set_todo_completed(todo, changes["completed"])
+    todo._json_bytes = None
+    mark_todos_changed()
+
+def list_todos(completed: Optional[bool] = None) -> List[Todo]:
+    """All todos in creation order, optionally only those with the given completion status"""
+    if completed is None:
+        return list(todos_storage.values())
+    todo_ids = completed_todo_ids if completed else active_todo_ids
+    return [todos_storage[todo_id] for todo_id in todo_ids]
+
+def count_todos(completed: Optional[bool] = None) -> int:
+    """Number of todos, optionally only those with the given completion status"""
+    if completed is None:
+        return len(todos_storage)
+    return len(completed_todo_ids if completed else active_todo_ids)
+
+def todo_list_json(completed: Optional[bool] = None) -> bytes:
+    """JSON array of list_todos(completed), spliced from per-todo bytes and cached until the next change"""
+    body = todo_list_cache.get(completed)
+    if body is None:
+        body = todo_list_cache[completed] = b"[" + b",".join([todo_json(todo) for todo in list_todos(completed)]) + b"]"
+    return body
+
+# Fields that may be requested as columns via GET /api/todos?fields=...
+TODO_FIELDS = frozenset(Todo.model_fields)
+
+def parse_todo_fields(fields: str) -> Tuple[str, ...]:
+    """Split a comma-separated field list, raising ValueError for names not in TODO_FIELDS"""
+    names = tuple(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in names if name not in TODO_FIELDS]
+    if not names or unknown:
+        raise ValueError(f"fields must be a comma-separated subset of: {', '.join(Todo.model_fields)}")
+    return names
+
+def todo_columns_json(completed: Optional[bool], fields: Tuple[str, ...]) -> bytes:
+    """list_todos(completed) as one JSON array per field ({"id": [...], "title": [...]})"""
+    todos = list_todos(completed)
+    return orjson.dumps({name: [getattr(todo, name) for todo in todos] for name in fields})
+
+# Chat sessions expire after an hour of inactivity when stored in Redis
+CHAT_SESSION_TTL_SECONDS = 3600
+
+# Number of dicts the in-memory session store is split across, keeping each hash table small
+CHAT_SESSION_SHARDS = 16
+
+
+class InMemoryChatSessionStore:
+    """Process-local chat session storage (single worker only)"""
+    
+    def __init__(self, shards: int = CHAT_SESSION_SHARDS):
+        self._shards: List[Dict[str, ChatSession]] = [{} for _ in range(shards)]
+    
+    def _shard(self, session_id: str) -> Dict[str, ChatSession]:
+        return self._shards[hash(session_id) % len(self._shards)]
+    
+    def _get_session(self, session_id: str) -> Optional[ChatSession]:
+        return self._shard(session_id).get(session_id)
+    
+    async def create(self, session: ChatSession) -> bool:
+        """Store a new session; returns False if the ID is already taken"""
+        shard = self._shard(session.session_id)
+        if session.session_id in shard:
+            return False
+        shard[session.session_id] = session
+        return True
+    
+    async def get(self, session_id: str) -> Optional[ChatSession]:
+        return self._get_session(session_id)
+    
+    async def save(self, session: ChatSession) -> None:
+        self._shard(session.session_id)[session.session_id] = session
+    
+    async def close(self) -> None:
+        pass
+
+
+class RedisChatSessionStore:
+    """Chat session storage shared by every worker through Redis"""
+    
+    def __init__(self, url: str, ttl: int = CHAT_SESSION_TTL_SECONDS):
+        self._redis = redis_asyncio.from_url(url)
+        self._ttl = ttl
+    
+    @staticmethod
+    def _key(session_id: str) -> str:
+        return f"chat:{session_id}"
+    
+    async def create(self, session: ChatSession) -> bool:
+        """Store a new session atomically (SET NX); returns False if the ID is already taken"""
+        created = await self._redis.set(
+            self._key(session.session_id), orjson.dumps(asdict(session)), ex=self._ttl, nx=True
+        )
+        return bool(created)
+    
+    async def get(self, session_id: str) -> Optional[ChatSession]:
+        data = await self._redis.get(self._key(session_id))
+        return ChatSession(**orjson.loads(data)) if data else None
+    
+    async def save(self, session: ChatSession) -> None:
+        await self._redis.set(self._key(session.session_id), orjson.dumps(asdict(session)), ex=self._ttl)
+    
+    async def close(self) -> None:
+        await self._redis.aclose()
+
 
 # Session storage for chat sessions
-chat_sessions: Dict[str, ChatSession] = {}
+if settings.redis_url and REDIS_AVAILABLE:
+    chat_sessions = RedisChatSessionStore(settings.redis_url)
+    logger.info("✓ Chat sessions stored in Redis")
+else:
+    if settings.redis_url:
+        logger.warning("⚠️ REDIS_URL is set but the redis package is not installed - using in-memory chat sessions")
+    chat_sessions = InMemoryChatSessionStore()
+
+def todo_to_dict(todo: Todo) -> dict:
+    """Field values of a todo without going through Pydantic's serializer (read-only view)"""
+    return todo.__dict__
+
+def new_todo(title, description="", priority="medium") -> Todo:
+    """Validate the fields of a new todo and build it without re-running Pydantic validation"""
+    title = validate_title(title)
+    if description is None:
+        description = ""
+    validate_description(description)
+    validate_priority(priority)
+    
+    # Fields are known-good at this point, so skip the validator
+    return Todo.model_construct(
+        id=next_todo_id(),
+        title=title,
+        description=description,
+        completed=False,
+        priority=priority,
+        created_at=get_current_time()
+    )
+
+def todo_json(todo: Todo) -> bytes:
+    """JSON bytes for a todo, cached on the todo until it is modified"""
+    if todo._json_bytes is None:
+        todo._json_bytes = orjson.dumps(todo.__dict__)
+    return todo._json_bytes
 
 def get_current_time() -> str:
     return datetime.now().isoformat()
 
+async def read_json_object(request: Request) -> dict:
+    """Parse a JSON object request body with orjson"""
+    try:
+        data = orjson.loads(await request.body())
+    except orjson.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Invalid JSON body")
+    if not isinstance(data, dict):
+        raise HTTPException(status_code=400, detail="JSON body must be an object")
+    return data
+
 def generate_session_id() -> str:
-    """Generate a unique session ID"""
-    import uuid
-    return str(uuid.uuid4())
+    """Generate a unique session ID (opaque 128-bit random hex string)"""
+    return secrets.token_hex(16)
+
+# Maximum pooled keep-alive connections to Azure AI Foundry shared by all agent clients
+AZURE_HTTP_POOL_MAXSIZE = 32
+
+# Maximum agent runs in flight at once; each run uses up to two pooled connections at a time
+CHAT_MAX_CONCURRENCY = AZURE_HTTP_POOL_MAXSIZE // 2
+
+# Worker threads for the blocking SDK calls (asyncio.to_thread). The default pool is sized from
+# the CPU count, which on small App Service plans is far below two threads per concurrent run.
+SDK_THREAD_POOL_SIZE = CHAT_MAX_CONCURRENCY * 2
+
 
 class AzureAIAgentService:
     
     def __init__(self):
         self.agents_client = None
+        self.credential = None
+        self.transport = None
+        self._http_session = None
         self.is_initialized = False
+        self._chat_semaphore = asyncio.Semaphore(CHAT_MAX_CONCURRENCY)
+        self.chats_in_flight = 0
+        self.chats_waiting = 0
         
     async def initialize(self):
         """Initialize Azure AI Agents Client"""
@@ -155,10 +487,20 @@ class AzureAIAgentService:
             return False
             
         try:
-            # Create agents client - use managed identity in production, dev credentials locally
+            # Create one credential for the process - use managed identity in production, dev credentials locally.
+            # No token is requested here; auth failures surface on the first SDK call.
+            self.credential = DefaultAzureCredential()
+            
+            # One pooled HTTP session shared by every AgentsClient, so per-request clients
+            # reuse warm TCP/TLS connections. session_owner=False keeps `with client:` from closing it.
+            self._http_session = requests.Session()
+            self._http_session.mount("https://", HTTPAdapter(pool_maxsize=AZURE_HTTP_POOL_MAXSIZE))
+            self.transport = RequestsTransport(session=self._http_session, session_owner=False)
+            
             self.agents_client = AgentsClient(
                 endpoint=PROJECT_ENDPOINT,
-                credential=DefaultAzureCredential()
+                credential=self.credential,
+                transport=self.transport
             )
             
             logger.info("Azure AI Agents Client initialized successfully")
@@ -170,6 +512,12 @@ class AzureAIAgentService:
             logger.error(f"Full traceback: {traceback.format_exc()}")
             return False
     
+    def close(self):
+        """Release the pooled HTTP connections"""
+        if self._http_session:
+            self._http_session.close()
+            self._http_session = None
+    
     async def create_agent_with_mcp(self, instructions: str = None) -> Optional[str]:
         """Create an agent with MCP tool integration"""
         if not self.is_initialized:
@@ -209,7 +557,31 @@ class AzureAIAgentService:
             logger.error(f"Full traceback: {traceback.format_exc()}")
             return None
     
+    def pool_stats(self) -> dict:
+        """Current usage of the bounded chat pool"""
+        return {
+            "max_concurrent_chats": CHAT_MAX_CONCURRENCY,
+            "chats_in_flight": self.chats_in_flight,
+            "chats_waiting": self.chats_waiting,
+            "http_pool_maxsize": AZURE_HTTP_POOL_MAXSIZE
+        }
+    
     async def chat_with_agent(self, message: str) -> ChatResponse:
+        """Run an agent interaction, queueing when CHAT_MAX_CONCURRENCY runs are already in flight"""
+        self.chats_waiting += 1
+        try:
+            await self._chat_semaphore.acquire()
+        finally:
+            self.chats_waiting -= 1
+        
+        self.chats_in_flight += 1
+        try:
+            return await self._run_chat(message)
+        finally:
+            self.chats_in_flight -= 1
+            self._chat_semaphore.release()
+    
+    async def _run_chat(self, message: str) -> ChatResponse:
         """Create a one-time agent interaction (simplified version)"""
         if not self.is_initialized:
             await self.initialize()
@@ -218,10 +590,12 @@ class AzureAIAgentService:
         
         # Create a fresh client for each request to avoid transport issues
         try:
-            # Create fresh agents client for this request (exactly like working sample)
+            # Create fresh agents client for this request (exactly like working sample).
+            # The shared credential keeps its token cache, so this does not trigger a new AAD round-trip.
             fresh_client = AgentsClient(
                 endpoint=PROJECT_ENDPOINT,
-                credential=DefaultAzureCredential()
+                credential=self.credential,
+                transport=self.transport
             )
             
             # Use external MCP server instead of self-hosted
@@ -237,22 +611,35 @@ class AzureAIAgentService:
             Use the available memory tools to remember and recall information."""
             
             with fresh_client:
-                # Create agent with MCP tool definitions (exactly like working sample)
-                agent = fresh_client.create_agent(
-                    model=MODEL_DEPLOYMENT,
-                    name="memory-mcp-agent",
-                    instructions=instructions,
-                    tools=mcp_tool.definitions,
+                # Create agent with MCP tool definitions and the thread for communication.
+                # The two calls are independent, so run them concurrently in worker threads.
+                agent, thread = await asyncio.gather(
+                    asyncio.to_thread(
+                        fresh_client.create_agent,
+                        model=MODEL_DEPLOYMENT,
+                        name="memory-mcp-agent",
+                        instructions=instructions,
+                        tools=mcp_tool.definitions,
+                    ),
+                    asyncio.to_thread(fresh_client.threads.create),
+                    return_exceptions=True,
                 )
+                if isinstance(agent, BaseException) or isinstance(thread, BaseException):
+                    # Don't leak whichever of the two was created, then surface the first failure
+                    if not isinstance(agent, BaseException):
+                        await asyncio.to_thread(fresh_client.delete_agent, agent.id)
+                    if not isinstance(thread, BaseException):
+                        await asyncio.to_thread(fresh_client.threads.delete, thread.id)
+                    raise agent if isinstance(agent, BaseException) else thread
                 logger.info(f"Created agent with external memory MCP tools, ID: {agent.id}")
                 logger.info(f"MCP Server: {mcp_tool.server_label} at {mcp_tool.server_url}")
-                
-                # Create thread for communication (exactly like working sample)
-                thread = fresh_client.threads.create()
                 logger.info(f"Created thread, ID: {thread.id}")
                 
+                # The SDK client is synchronous, so every remaining call runs in a worker thread
+                # to keep the event loop serving other requests while the agent works.
                 # Create message on the thread (exactly like working sample)
-                message_obj = fresh_client.messages.create(
+                message_obj = await asyncio.to_thread(
+                    fresh_client.messages.create,
                     thread_id=thread.id,
                     role="user",
                     content=message,
@@ -263,7 +650,8 @@ class AzureAIAgentService:
                 mcp_tool.set_approval_mode("never")
                 
                 # Create and process agent run with MCP tools (exactly like working sample)
-                run = fresh_client.runs.create_and_process(
+                run = await asyncio.to_thread(
+                    fresh_client.runs.create_and_process,
                     thread_id=thread.id,
                     agent_id=agent.id,
                     tool_resources=mcp_tool.resources
@@ -277,7 +665,10 @@ class AzureAIAgentService:
                 
                 # Display run steps and tool calls (exactly like working sample)
                 try:
-                    run_steps = fresh_client.run_steps.list(thread_id=thread.id, run_id=run.id)
+                    # Pages are fetched while iterating, so drain the pager in the worker thread
+                    run_steps = await asyncio.to_thread(
+                        list, fresh_client.run_steps.list(thread_id=thread.id, run_id=run.id)
+                    )
                     for step in run_steps:
                         logger.info(f"Step {step['id']} status: {step['status']}")
                         
@@ -296,7 +687,7 @@ class AzureAIAgentService:
                 
                 if "completed" in str(run.status).lower():
                     # Fetch and log all messages (exactly like working sample)
-                    messages = fresh_client.messages.list(thread_id=thread.id)
+                    messages = await asyncio.to_thread(list, fresh_client.messages.list(thread_id=thread.id))
                     logger.info("Conversation:")
                     logger.info("-" * 50)
                     for msg in messages:
@@ -318,7 +709,7 @@ class AzureAIAgentService:
                     assistant_response = f"Run completed with status: {run.status}"
                 
                 # Clean up - delete the agent (exactly like working sample)
-                fresh_client.delete_agent(agent.id)
+                await asyncio.to_thread(fresh_client.delete_agent, agent.id)
                 logger.info("Deleted agent")
                 
                 return ChatResponse(
@@ -337,6 +728,23 @@ ai_service = AzureAIAgentService() if AI_CONFIG_AVAILABLE else None
 
 # Template configuration
 templates = Jinja2Templates(directory="templates")
+templates.env.auto_reload = False
+
+# The pages are static shells (all data is loaded client-side), so render them once at startup
+INDEX_HTML = templates.get_template("index.html").render()
+CHAT_HTML = templates.get_template("chat.html").render()
+
+# Asset URLs are not fingerprinted, so cache for a day and let the ETag handle revalidation
+STATIC_CACHE_CONTROL = "public, max-age=86400"
+
+
+class CachedStaticFiles(StaticFiles):
+    """Static files served with a Cache-Control header"""
+
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = STATIC_CACHE_CONTROL
+        return response
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -344,6 +752,9 @@ async def lifespan(app: FastAPI):
     
     # Initialize Azure AI service if available
     if ai_service and AI_CONFIG_AVAILABLE:
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(max_workers=SDK_THREAD_POOL_SIZE, thread_name_prefix="azure-sdk")
+        )
         await ai_service.initialize()
         logger.info("✓ Azure AI service initialized")
     else:
@@ -351,41 +762,55 @@ async def lifespan(app: FastAPI):
     
     yield
     logger.info("Shutting down Todo MCP FastAPI Server")
+    if ai_service:
+        ai_service.close()
+    await chat_sessions.close()
 
 # Create FastAPI app
 app = FastAPI(
     title="Todo MCP Server with Azure AI Agents",
     description="Model Context Protocol server for todo management with AI agent integration",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
-# Add CORS middleware
+# Add CORS middleware (browsers cache the preflight response for a day)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=list(settings.allowed_origins),
+    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+    allow_headers=["Content-Type", "Accept", "Authorization"],
+    max_age=86400,
 )
 
+# Encode error bodies with orjson too, rather than Starlette's stdlib-json JSONResponse
+@app.exception_handler(StarletteHTTPException)
+async def http_exception_handler(request: Request, exc: StarletteHTTPException):
+    """Render HTTP errors as {"detail": ...} via ORJSONResponse"""
+    return ORJSONResponse(
+        content={"detail": exc.detail},
+        status_code=exc.status_code,
+        headers=getattr(exc, "headers", None)
+    )
+
 # Mount static files
-app.mount("/static", StaticFiles(directory="static"), name="static")
+app.mount("/static", CachedStaticFiles(directory="static"), name="static")
 
 @app.get("/", response_class=HTMLResponse)
-async def root(request: Request):
+async def root():
     """Serve the main todo list page"""
-    return templates.TemplateResponse("index.html", {"request": request})
+    return HTMLResponse(content=INDEX_HTML)
 
 @app.get("/chat", response_class=HTMLResponse)
-async def chat_page(request: Request):
+async def chat_page():
     """Serve the chat interface page"""
-    return templates.TemplateResponse("chat.html", {"request": request})
+    return HTMLResponse(content=CHAT_HTML)
 
 @app.get("/health")
 async def health():
     """Health check endpoint"""
-    return {
+    return ORJSONResponse(content={
         "status": "healthy", 
         "todos_count": len(todos_storage),
         "azure_ai_available": AZURE_AI_AVAILABLE,
@@ -394,79 +819,109 @@ async def health():
         ),
         "project_endpoint": PROJECT_ENDPOINT,
         "mcp_server_url": MCP_SERVER_URL
-    }
+    })
 
 @app.get("/debug")
-async def debug():
-    """Debug endpoint with configuration info"""
-    return {
+async def debug(request: Request):
+    """Debug endpoint with configuration info (requires the X-Debug-Token header)"""
+    if not settings.debug_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not secrets.compare_digest(request.headers.get("x-debug-token", ""), settings.debug_token):
+        raise HTTPException(status_code=403, detail="Invalid debug token")
+    
+    return ORJSONResponse(content={
         "azure_ai_available": AZURE_AI_AVAILABLE,
-        "ai_service_initialized": ai_service.is_initialized,
+        "ai_service_initialized": ai_service.is_initialized if ai_service else False,
         "project_endpoint": PROJECT_ENDPOINT,
         "model_deployment": MODEL_DEPLOYMENT,
         "mcp_server_url": MCP_SERVER_URL,
         "mcp_server_label": MCP_SERVER_LABEL,
         "todos_count": len(todos_storage)
-    }
+    })
 
 # REST API endpoints for direct todo management
-@app.get("/api/todos")
-async def get_todos(completed: Optional[bool] = None):
-    """Get all todos with optional completion filter"""
-    todos = list(todos_storage.values())
+@app.get("/api/todos", response_model=None)
+async def get_todos(request: Request, completed: Optional[bool] = None, fields: Optional[str] = None):
+    """Get all todos with optional completion filter, or only the requested fields as columns"""
+    if fields is not None:
+        try:
+            field_names = parse_todo_fields(fields)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
     
-    if completed is not None:
-        todos = [todo for todo in todos if todo.completed == completed]
+    # no-cache: clients may keep the body but must revalidate it with If-None-Match
+    etag_fields = "" if fields is None else "-" + ",".join(field_names)
+    headers = {
+        "ETag": f'W/"{TODOS_ETAG_PREFIX}-{todos_version}-{completed}{etag_fields}"',
+        "Cache-Control": "no-cache"
+    }
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
     
-    return [todo.dict() for todo in todos]
+    body = todo_list_json(completed) if fields is None else todo_columns_json(completed, field_names)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 @app.post("/api/todos")
-async def create_todo_api(todo_data: dict):
+async def create_todo_api(request: Request):
     """Create a new todo via REST API"""
-    global next_id
+    todo_data = await read_json_object(request)
     try:
-        todo = Todo(
-            id=next_id,
-            title=todo_data["title"],
+        todo = new_todo(
+            title=todo_data.get("title"),
             description=todo_data.get("description", ""),
-            priority=todo_data.get("priority", "medium"),
-            created_at=get_current_time()
+            priority=todo_data.get("priority", "medium")
         )
-        todos_storage[next_id] = todo
-        logger.info(f"📝 Created todo #{next_id}: '{todo_data['title']}' "
-                   f"(priority: {todo_data.get('priority', 'medium')})")
-        next_id += 1
-        return todo.dict()
-    except Exception as e:
+    except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    
+    add_todo(todo)
+    logger.info(f"📝 Created todo #{todo.id}: '{todo.title}' (priority: {todo.priority})")
+    return Response(content=todo_json(todo), media_type="application/json")
 
 @app.put("/api/todos/{todo_id}")
-async def update_todo_api(todo_id: int, todo_data: dict):
+async def update_todo_api(todo_id: int, request: Request):
     """Update a todo via REST API"""
-    if todo_id not in todos_storage:
+    # Read the body before the lookup: no await may sit between finding the todo and changing it,
+    # or a concurrent DELETE could remove it in between
+    todo_data = await read_json_object(request)
+    todo = todos_storage.get(todo_id)
+    if todo is None:
         raise HTTPException(status_code=404, detail="Todo not found")
     
-    todo = todos_storage[todo_id]
+    try:
+        update_todo_fields(todo, todo_data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return Response(content=todo_json(todo), media_type="application/json")
+
+@app.patch("/api/todos/{todo_id}/complete")
+async def toggle_todo_complete(todo_id: int, request: Request):
+    """Set a todo's completion status via REST API, or toggle it when no value is given"""
+    # Body first, so nothing awaits between the lookup and the update (see update_todo_api)
+    completion_data = await read_json_object(request) if await request.body() else {}
+    completed = completion_data.get("completed")
+    if completed is not None:
+        try:
+            validate_completed(completed)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    todo = todos_storage.get(todo_id)
+    if todo is None:
+        raise HTTPException(status_code=404, detail="Todo not found")
     
-    if "title" in todo_data:
-        todo.title = todo_data["title"]
-    if "description" in todo_data:
-        todo.description = todo_data["description"]
-    if "priority" in todo_data:
-        todo.priority = todo_data["priority"]
-    if "completed" in todo_data:
-        todo.completed = todo_data["completed"]
+    set_todo_completed(todo, (not todo.completed) if completed is None else completed)
     
-    return todo.dict()
+    return Response(content=todo_json(todo), media_type="application/json")
 
 @app.delete("/api/todos/{todo_id}")
 async def delete_todo_api(todo_id: int):
     """Delete a todo via REST API"""
-    if todo_id not in todos_storage:
+    deleted_todo = remove_todo(todo_id)
+    if deleted_todo is None:
         raise HTTPException(status_code=404, detail="Todo not found")
     
-    deleted_todo = todos_storage.pop(todo_id)
-    return {"message": "Todo deleted successfully", "deleted_todo": deleted_todo.dict()}
+    return ORJSONResponse(content={"message": "Todo deleted successfully", "deleted_todo": todo_to_dict(deleted_todo)})
 
 # AI Chat API endpoints
 @app.post("/api/chat/session", response_model=ChatSession)
@@ -480,7 +935,8 @@ async def create_chat_session():
     
     session_id = generate_session_id()
     session = ChatSession(session_id=session_id)
-    chat_sessions[session_id] = session
+    if not await chat_sessions.create(session):
+        raise HTTPException(status_code=409, detail="Chat session already exists")
     
     return session
 
@@ -494,13 +950,13 @@ async def chat_with_ai_session(chat_message: ChatSessionMessage):
         )
     
     # Validate session exists
-    if chat_message.session_id not in chat_sessions:
+    session = await chat_sessions.get(chat_message.session_id)
+    if session is None:
         raise HTTPException(
             status_code=404,
             detail="Chat session not found"
         )
     
-    session = chat_sessions[chat_message.session_id]
     response = await ai_service.chat_with_agent(chat_message.message)
     
     # Update session with agent/thread info if available
@@ -508,6 +964,7 @@ async def chat_with_ai_session(chat_message: ChatSessionMessage):
         session.agent_id = response.agent_id
     if response.thread_id:
         session.thread_id = response.thread_id
+    await chat_sessions.save(session)
     
     return response
 
@@ -525,19 +982,56 @@ async def chat_with_ai(chat_message: ChatMessage):
     logger.info(f"🤖 AI response: '{response.response[:50]}{'...' if len(response.response) > 50 else ''}'")
     return response
 
-@app.get("/api/chat/status")
+# Chat status fields that are fixed once configuration has been loaded
+CHAT_STATUS_STATIC = {
+    "azure_ai_packages_available": AZURE_AI_AVAILABLE,
+    "ai_config_available": AI_CONFIG_AVAILABLE,
+    "project_endpoint": PROJECT_ENDPOINT,
+    "model_deployment": MODEL_DEPLOYMENT,
+    "mcp_server_configured": bool(MCP_SERVER_URL)
+}
+
+@app.get("/api/chat/status", response_model=None)
 async def chat_status():
     """Get the status of the Azure AI chat service"""
-    return {
+    return ORJSONResponse(content={
         "available": ai_service.is_initialized if ai_service else False,
-        "azure_ai_packages_available": AZURE_AI_AVAILABLE,
-        "ai_config_available": AI_CONFIG_AVAILABLE,
-        "project_endpoint": PROJECT_ENDPOINT,
-        "model_deployment": MODEL_DEPLOYMENT,
-        "mcp_server_configured": bool(MCP_SERVER_URL)
-    }
+        **CHAT_STATUS_STATIC,
+        "pool": ai_service.pool_stats() if ai_service else None
+    })
 
 # MCP Server Implementation
+class RpcMessage(msgspec.Struct):
+    """Inbound JSON-RPC envelope"""
+    jsonrpc: str = "2.0"
+    id: Union[int, str, None] = None
+    method: str = ""
+    params: dict = {}
+
+# Decodes and validates the envelope in a single pass, without building an intermediate dict
+RPC_DECODER = msgspec.json.Decoder(RpcMessage)
+
+# JSON-RPC envelopes are assembled from these fixed byte fragments plus the encoded id and payload
+RPC_PREFIX = b'{"jsonrpc":"2.0","id":'
+RPC_RESULT_KEY = b',"result":'
+RPC_ERROR_KEY = b',"error":'
+
+class RpcError(Exception):
+    """A JSON-RPC error to report back to the MCP client"""
+    
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+def rpc_result(request_id, result) -> bytes:
+    """Encoded JSON-RPC success envelope"""
+    return RPC_PREFIX + orjson.dumps(request_id) + RPC_RESULT_KEY + orjson.dumps(result) + b"}"
+
+def rpc_error(request_id, code: int, message: str) -> bytes:
+    """Encoded JSON-RPC error envelope"""
+    return RPC_PREFIX + orjson.dumps(request_id) + RPC_ERROR_KEY + orjson.dumps({"code": code, "message": message}) + b"}"
+
 class MCPServer:
     def __init__(self):
         self.tools = {
@@ -547,9 +1041,9 @@ class MCPServer:
                 "inputSchema": {
                     "type": "object",
                     "properties": {
-                        "title": {"type": "string", "description": "Title of the todo"},
+                        "title": {"type": "string", "maxLength": TODO_TITLE_MAX_LENGTH, "description": "Title of the todo"},
                         "description": {"type": "string", "description": "Optional description"},
-                        "priority": {"type": "string", "enum": ["low", "medium", "high"], "description": "Priority level"}
+                        "priority": {"type": "string", "enum": list(PRIORITIES), "description": "Priority level"}
                     },
                     "required": ["title"]
                 }
@@ -571,9 +1065,9 @@ class MCPServer:
                     "type": "object",
                     "properties": {
                         "todo_id": {"type": "integer", "description": "Todo ID to update"},
-                        "title": {"type": "string", "description": "New title"},
+                        "title": {"type": "string", "maxLength": TODO_TITLE_MAX_LENGTH, "description": "New title"},
                         "description": {"type": "string", "description": "New description"},
-                        "priority": {"type": "string", "enum": ["low", "medium", "high"], "description": "Priority level"},
+                        "priority": {"type": "string", "enum": list(PRIORITIES), "description": "Priority level"},
                         "completed": {"type": "boolean", "description": "Completion status"}
                     },
                     "required": ["todo_id"]
@@ -604,246 +1098,267 @@ class MCPServer:
             }
         }
 
-    async def handle_request(self, request_data: dict) -> dict:
-        """Handle MCP JSON-RPC requests"""
-        method = request_data.get("method")
-        params = request_data.get("params", {})
-        request_id = request_data.get("id")
-
-        try:
-            if method == "initialize":
-                result = {
-                    "protocolVersion": "2024-11-05",
-                    "capabilities": {
-                        "tools": {"listChanged": True},
-                        "resources": {"subscribe": True, "listChanged": True}
-                    },
-                    "serverInfo": {
-                        "name": "Todo MCP Server",
-                        "version": "1.0.0"
-                    }
-                }
-            elif method == "tools/list":
-                result = {"tools": list(self.tools.values())}
-            elif method == "tools/call":
-                result = await self.handle_tool_call(params)
-            else:
-                return {
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "error": {"code": -32601, "message": f"Method not found: {method}"}
-                }
+        # JSON-RPC method -> handler, built once so each request is a single dict lookup
+        self._method_handlers = {
+            "initialize": self.handle_initialize,
+            "tools/list": self.handle_tools_list,
+            "tools/call": self.handle_tool_call,
+        }
 
-            return {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": result
+        # Tool name -> handler, built once so each call is a single dict lookup
+        self._tool_handlers = {
+            "create_todo": self._call_create_todo,
+            "list_todos": self._call_list_todos,
+            "update_todo": self._call_update_todo,
+            "delete_todo": self._call_delete_todo,
+            "mark_todo_complete": self._call_mark_todo_complete,
+        }
+        # initialize and tools/list never change, so encode them once and splice the bytes into each envelope
+        self._initialize_result = orjson.Fragment(orjson.dumps({
+            "protocolVersion": "2024-11-05",
+            "capabilities": {
+                "tools": {"listChanged": True},
+                "resources": {"subscribe": True, "listChanged": True}
+            },
+            "serverInfo": {
+                "name": "Todo MCP Server",
+                "version": "1.0.0"
             }
+        }))
+        self._tools_list_result = orjson.Fragment(orjson.dumps({"tools": list(self.tools.values())}))
 
-        except Exception as e:
+    def handle_request(self, rpc: RpcMessage):
+        """Handle an MCP JSON-RPC request and return its result; raises RpcError on failure"""
+        handler = self._method_handlers.get(rpc.method)
+        if handler is None:
+            raise RpcError(-32601, f"Method not found: {rpc.method}")
+
+        # Tool handlers report bad input and unknown todos/tools as ValueError; anything else is a
+        # bug and is left to the endpoint's catch-all, which logs the traceback and answers 500
+        try:
+            return handler(rpc.params)
+        except ValueError as e:
             logger.error(f"Error handling MCP request: {e}")
-            return {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "error": {"code": -32603, "message": f"Internal error: {str(e)}"}
-            }
+            raise RpcError(-32603, f"Internal error: {str(e)}")
+
+    def handle_initialize(self, params: dict) -> orjson.Fragment:
+        """Handle the MCP initialize handshake"""
+        return self._initialize_result
+
+    def handle_tools_list(self, params: dict) -> orjson.Fragment:
+        """List the available MCP tools"""
+        return self._tools_list_result
 
-    async def handle_tool_call(self, params: dict) -> dict:
+    def handle_tool_call(self, params: dict) -> dict:
         """Handle MCP tool calls"""
-        global next_id
-        
         tool_name = params.get("name")
+        if not isinstance(tool_name, str):
+            raise ValueError("Tool name must be a string")
         arguments = params.get("arguments", {})
+        if not isinstance(arguments, dict):
+            raise ValueError("Tool arguments must be an object")
 
-        if tool_name == "create_todo":
-            title = arguments.get("title")
-            if not title:
-                raise ValueError("Title is required")
-            
-            todo = Todo(
-                id=next_id,
-                title=title,
-                description=arguments.get("description", ""),
-                priority=arguments.get("priority", "medium"),
-                created_at=get_current_time()
-            )
-            todos_storage[next_id] = todo
-            next_id += 1
-            
-            return {
-                "content": [
-                    {
-                        "type": "text",
-                        "text": f"Created todo: {todo.dict()}"
-                    }
-                ]
-            }
-            
-        elif tool_name == "list_todos":
-            filter_completed = arguments.get("filter_completed")
-            todos = list(todos_storage.values())
-            
-            if filter_completed is not None:
-                todos = [todo for todo in todos if todo.completed == filter_completed]
-            
-            todos_data = [todo.dict() for todo in todos]
-            return {
-                "content": [
-                    {
-                        "type": "text",
-                        "text": f"Found {len(todos_data)} todos: {todos_data}"
-                    }
-                ]
-            }
-            
-        elif tool_name == "update_todo":
-            todo_id = arguments.get("todo_id")
-            if todo_id not in todos_storage:
-                raise ValueError(f"Todo {todo_id} not found")
-            
-            todo = todos_storage[todo_id]
-            if "title" in arguments:
-                todo.title = arguments["title"]
-            if "description" in arguments:
-                todo.description = arguments["description"]
-            if "priority" in arguments:
-                todo.priority = arguments["priority"]
-            if "completed" in arguments:
-                todo.completed = arguments["completed"]
-            
-            return {
-                "content": [
-                    {
-                        "type": "text",
-                        "text": f"Updated todo: {todo.dict()}"
-                    }
-                ]
-            }
-            
-        elif tool_name == "delete_todo":
-            todo_id = arguments.get("todo_id")
-            if todo_id not in todos_storage:
-                raise ValueError(f"Todo {todo_id} not found")
-            
-            deleted_todo = todos_storage.pop(todo_id)
-            return {
-                "content": [
-                    {
-                        "type": "text",
-                        "text": f"Deleted todo: {deleted_todo.dict()}"
-                    }
-                ]
-            }
-            
-        elif tool_name == "mark_todo_complete":
-            todo_id = arguments.get("todo_id")
-            if todo_id not in todos_storage:
-                raise ValueError(f"Todo {todo_id} not found")
-            
-            todo = todos_storage[todo_id]
-            todo.completed = arguments.get("completed", True)
-            
-            return {
-                "content": [
-                    {
-                        "type": "text",
-                        "text": f"Marked todo as {'complete' if todo.completed else 'incomplete'}: {todo.dict()}"
-                    }
-                ]
-            }
-        
-        else:
+        handler = self._tool_handlers.get(tool_name)
+        if handler is None:
             raise ValueError(f"Unknown tool: {tool_name}")
+        return handler(arguments)
+
+    @staticmethod
+    def _todo_id_argument(arguments: dict) -> int:
+        """The integer todo_id argument; anything else (including booleans) is a ValueError"""
+        todo_id = arguments.get("todo_id")
+        if not isinstance(todo_id, int) or isinstance(todo_id, bool):
+            raise ValueError("todo_id must be an integer")
+        return todo_id
+
+    def _call_create_todo(self, arguments: dict) -> dict:
+        todo = new_todo(
+            title=arguments.get("title"),
+            description=arguments.get("description", ""),
+            priority=arguments.get("priority", "medium")
+        )
+        add_todo(todo)
+        
+        return {
+            "content": [
+                {
+                    "type": "text",
+                    "text": f"Created todo: {todo_json(todo).decode()}"
+                }
+            ]
+        }
+
+    def _call_list_todos(self, arguments: dict) -> dict:
+        completed = arguments.get("filter_completed")
+        if completed is not None:
+            validate_completed(completed)
+        
+        return {
+            "content": [
+                {
+                    "type": "text",
+                    "text": f"Found {count_todos(completed)} todos: {todo_list_json(completed).decode()}"
+                }
+            ]
+        }
+
+    def _call_update_todo(self, arguments: dict) -> dict:
+        todo_id = self._todo_id_argument(arguments)
+        todo = todos_storage.get(todo_id)
+        if todo is None:
+            raise ValueError(f"Todo {todo_id} not found")
+        
+        update_todo_fields(todo, arguments)
+        
+        return {
+            "content": [
+                {
+                    "type": "text",
+                    "text": f"Updated todo: {todo_json(todo).decode()}"
+                }
+            ]
+        }
+
+    def _call_delete_todo(self, arguments: dict) -> dict:
+        todo_id = self._todo_id_argument(arguments)
+        deleted_todo = remove_todo(todo_id)
+        if deleted_todo is None:
+            raise ValueError(f"Todo {todo_id} not found")
+        
+        return {
+            "content": [
+                {
+                    "type": "text",
+                    "text": f"Deleted todo: {todo_json(deleted_todo).decode()}"
+                }
+            ]
+        }
+
+    def _call_mark_todo_complete(self, arguments: dict) -> dict:
+        todo_id = self._todo_id_argument(arguments)
+        todo = todos_storage.get(todo_id)
+        if todo is None:
+            raise ValueError(f"Todo {todo_id} not found")
+        
+        completed = arguments.get("completed", True)
+        validate_completed(completed)
+        set_todo_completed(todo, completed)
+        
+        return {
+            "content": [
+                {
+                    "type": "text",
+                    "text": f"Marked todo as {'complete' if todo.completed else 'incomplete'}: {todo_json(todo).decode()}"
+                }
+            ]
+        }
 
 # Initialize MCP server
 mcp_server = MCPServer()
 
 # MCP Server endpoints (for direct MCP client access)
-@app.get("/mcp/stream")
-async def mcp_stream_info():
-    """Information about the MCP stream endpoint with enhanced compatibility info"""
-    return {
-        "info": "MCP Streamable HTTP Transport Endpoint", 
-        "description": "This endpoint provides access to todo management tools via MCP",
-        "mcp_server_url": MCP_SERVER_URL,
-        "protocol_version": "2024-11-05",
-        "transport": "http",
-        "capabilities": {
-            "tools": {
-                "listChanged": True
-            }
-        },
-        "server_info": {
-            "name": "Todo MCP Server",
-            "version": "1.0.0"
-        },
-        "available_tools": [
-            "create_todo", 
-            "list_todos", 
-            "update_todo", 
-            "delete_todo", 
-            "mark_todo_complete"
-        ],
-        "endpoints": {
-            "jsonrpc": f"{MCP_SERVER_URL}",
-            "methods": ["initialize", "tools/list", "tools/call"]
+# Static MCP responses, serialized once at import
+MCP_INFO_JSON = orjson.dumps({
+    "info": "MCP Streamable HTTP Transport Endpoint", 
+    "description": "This endpoint provides access to todo management tools via MCP",
+    "mcp_server_url": MCP_SERVER_URL,
+    "protocol_version": "2024-11-05",
+    "transport": "http",
+    "capabilities": {
+        "tools": {
+            "listChanged": True
         }
+    },
+    "server_info": {
+        "name": "Todo MCP Server",
+        "version": "1.0.0"
+    },
+    "available_tools": list(mcp_server.tools),
+    "endpoints": {
+        "jsonrpc": f"{MCP_SERVER_URL}",
+        "methods": ["initialize", "notifications/initialized", "tools/list", "tools/call"]
     }
+})
+
+# The info body is fixed for the life of the process, so it gets a strong content-hash ETag
+MCP_INFO_HEADERS = {
+    "ETag": '"' + hashlib.blake2b(MCP_INFO_JSON, digest_size=16).hexdigest() + '"',
+    "Cache-Control": "public, max-age=3600"
+}
+
+MCP_OPTIONS_JSON = orjson.dumps({
+    "status": "ok",
+    "methods": ["POST", "OPTIONS"],
+    "headers": ["Content-Type", "Accept"]
+})
 
-@app.post("/mcp/stream")
+@app.get("/mcp/stream", response_model=None)
+async def mcp_stream_info(request: Request):
+    """Information about the MCP stream endpoint with enhanced compatibility info"""
+    if request.headers.get("if-none-match") == MCP_INFO_HEADERS["ETag"]:
+        return Response(status_code=304, headers=MCP_INFO_HEADERS)
+    return Response(content=MCP_INFO_JSON, media_type="application/json", headers=MCP_INFO_HEADERS)
+
+@app.post("/mcp/stream", response_model=None)
 async def mcp_stream_endpoint(request: Request):
     """Main MCP endpoint with JSON-RPC support and enhanced compatibility"""
     try:
-        # Get request data
-        request_data = await request.json()
-        logger.info(f"MCP request received: method={request_data.get('method')}, id={request_data.get('id')}")
+        rpc = RPC_DECODER.decode(await request.body())
+    except msgspec.ValidationError as e:
+        logger.warning(f"Invalid MCP request: {e}")
+        return Response(
+            content=rpc_error(None, -32600, f"Invalid Request: {str(e)}"),
+            status_code=400,
+            media_type="application/json"
+        )
+    except msgspec.DecodeError as e:
+        logger.warning(f"MCP request with invalid JSON: {e}")
+        return Response(
+            content=rpc_error(None, -32700, f"Parse error: {str(e)}"),
+            status_code=400,
+            media_type="application/json"
+        )
+    
+    try:
+        logger.info(f"MCP request received: method={rpc.method}, id={rpc.id}")
+        
+        # Notifications (e.g. notifications/initialized) expect no JSON-RPC response
+        if rpc.method.startswith("notifications/"):
+            return Response(status_code=202)
         
         # Handle the request through our MCP server
-        response_data = await mcp_server.handle_request(request_data)
-        logger.info(f"MCP response: id={response_data.get('id')}, has_result={bool(response_data.get('result'))}, has_error={bool(response_data.get('error'))}")
+        try:
+            result = mcp_server.handle_request(rpc)
+        except RpcError as e:
+            logger.info(f"MCP response: id={rpc.id}, has_result=False, has_error=True")
+            return Response(
+                content=rpc_error(rpc.id, e.code, e.message),
+                media_type="application/json",
+                headers={"Cache-Control": "no-cache"}
+            )
+        logger.info(f"MCP response: id={rpc.id}, has_result={bool(result)}, has_error=False")
         
         # Return with proper headers for compatibility
-        return JSONResponse(
-            content=response_data,
-            headers={
-                "Content-Type": "application/json",
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Methods": "POST, OPTIONS",
-                "Access-Control-Allow-Headers": "Content-Type, Accept, Authorization",
-                "Cache-Control": "no-cache"
-            }
+        return Response(
+            content=rpc_result(rpc.id, result),
+            media_type="application/json",
+            headers={"Cache-Control": "no-cache"}
         )
         
     except Exception as e:
         logger.error(f"Error in MCP endpoint: {e}")
         logger.error(f"Full traceback: {traceback.format_exc()}")
         
-        error_response = {
-            "jsonrpc": "2.0",
-            "id": request_data.get("id") if "request_data" in locals() else None,
-            "error": {
-                "code": -32603,
-                "message": f"Internal error: {str(e)}"
-            }
-        }
-        
-        return JSONResponse(
-            content=error_response,
+        return Response(
+            content=rpc_error(rpc.id, -32603, f"Internal error: {str(e)}"),
             status_code=500,
-            headers={
-                "Content-Type": "application/json",
-                "Access-Control-Allow-Origin": "*"
-            }
+            media_type="application/json"
         )
 
-@app.options("/mcp/stream")
+@app.options("/mcp/stream", response_model=None)
 async def mcp_stream_options():
     """Handle CORS preflight for MCP stream endpoint"""
-    return {
-        "status": "ok",
-        "methods": ["POST", "OPTIONS"],
-        "headers": ["Content-Type", "Accept"]
-    }
+    return Response(content=MCP_OPTIONS_JSON, media_type="application/json")
 
 if __name__ == "__main__":
     import uvicorn
@@ -863,9 +1378,12 @@ if __name__ == "__main__":
     
     # Reduce access log verbosity
     uvicorn.run(
-        app, 
+        "main:app" if settings.workers > 1 else app,  # multiple workers need an import string
         host="0.0.0.0", 
         port=8000, 
+        loop="auto",          # uvloop when installed (uvicorn[standard]), asyncio otherwise
+        http="auto",          # httptools when installed, h11 otherwise
+        workers=settings.workers,
         log_level="warning",  # Changed from "info" to "warning"
         access_log=False      # Disable detailed access logs
     )